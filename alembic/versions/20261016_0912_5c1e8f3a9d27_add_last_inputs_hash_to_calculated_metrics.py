@@ -0,0 +1,28 @@
+"""add last_inputs_hash to calculated_metrics
+
+Revision ID: 5c1e8f3a9d27
+Revises: 144aed9ca35e
+Create Date: 2026-10-16 09:12:31.418203
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# Revision identifiers, used by Alembic
+revision: str = '5c1e8f3a9d27'
+down_revision: Union[str, None] = '144aed9ca35e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Apply migration: add last_inputs_hash to calculated_metrics"""
+    op.add_column('calculated_metrics', sa.Column('last_inputs_hash', sa.String(length=64), nullable=True, comment='SHA-256 of the inputs behind the last complete AI generation'))
+
+
+def downgrade() -> None:
+    """Revert migration: add last_inputs_hash to calculated_metrics"""
+    op.drop_column('calculated_metrics', 'last_inputs_hash')
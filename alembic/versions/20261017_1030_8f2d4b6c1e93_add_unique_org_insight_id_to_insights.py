@@ -0,0 +1,36 @@
+"""add unique (organization_id, insight_id) to insights
+
+Revision ID: 8f2d4b6c1e93
+Revises: 5c1e8f3a9d27
+Create Date: 2026-10-17 10:30:12.604118
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# Revision identifiers, used by Alembic
+revision: str = '8f2d4b6c1e93'
+down_revision: Union[str, None] = '5c1e8f3a9d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Apply migration: add unique (organization_id, insight_id) to insights"""
+    # insight_id is already globally unique (ix_insights_insight_id, see
+    # 9a5a7c124b69), so no existing rows can violate this; the constraint's
+    # index replaces the plain composite index
+    op.drop_index('ix_insights_org_insight_id', table_name='insights')
+    op.create_unique_constraint(
+        'uq_insights_org_insight_id',
+        'insights',
+        ['organization_id', 'insight_id'],
+    )
+
+
+def downgrade() -> None:
+    """Revert migration: add unique (organization_id, insight_id) to insights"""
+    op.drop_constraint('uq_insights_org_insight_id', 'insights', type_='unique')
+    op.create_index('ix_insights_org_insight_id', 'insights', ['organization_id', 'insight_id'], unique=False)
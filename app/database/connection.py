@@ -4,8 +4,9 @@ Configures async SQLAlchemy engine and session factory.
 """
 
 import logging
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 
+import orjson
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
@@ -16,6 +17,17 @@ from app.config import settings
 from app.database.base import Base
 
 
+def _json_serializer(value: Any) -> str:
+    """
+    Serialize JSON/JSONB column values with orjson.
+    
+    Much faster than the stdlib encoder for the large nested metric and
+    cache payloads. OPT_NON_STR_KEYS keeps parity with json.dumps, which
+    coerces int/float dict keys to strings.
+    """
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 # Create async engine with connection pooling
 # Use NullPool for serverless/testing, otherwise use default pool
 async_engine = create_async_engine(
@@ -23,6 +35,17 @@ async_engine = create_async_engine(
     echo=False,  # Disable SQL query logging
     future=True,
     pool_pre_ping=True,  # Verify connections before use
+    pool_size=settings.database_pool_size,
+    max_overflow=settings.database_max_overflow,
+    # Keep compiled statements and server-side prepared statements for the
+    # small, repeated cache and dashboard queries
+    query_cache_size=settings.database_query_cache_size,
+    connect_args={
+        "prepared_statement_cache_size": settings.database_prepared_statement_cache_size,
+        "statement_cache_size": settings.database_statement_cache_size,
+    },
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
 )
 
 # Session factory for creating new sessions
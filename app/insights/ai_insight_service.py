@@ -5,9 +5,9 @@ Generates financial insights using OpenAI with structured JSON output.
 
 import json
 import logging
-from typing import Any
+from typing import Any, Optional
 
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 from app.config import settings
 
@@ -17,26 +17,40 @@ logger = logging.getLogger(__name__)
 MAX_INPUT_TOKENS = 100000  # Leave room for output (~28k tokens)
 TOKENS_PER_CHAR = 0.25  # Rough estimate: ~4 chars = 1 token
 
+# Bump whenever prompts or JSON schemas change so stored AI output is regenerated
+PROMPT_VERSION = 1
+
+# Shared async client so concurrent syncs reuse one HTTP connection pool
+_async_client: Optional[AsyncOpenAI] = None
+
+
+def _get_async_client() -> AsyncOpenAI:
+    """Return the shared AsyncOpenAI client, creating it on first use."""
+    global _async_client
+    if _async_client is None:
+        _async_client = AsyncOpenAI(api_key=settings.openai_api_key)
+    return _async_client
+
 
 class AIInsightService:
     """Service for generating insights using OpenAI."""
     
     def __init__(self):
-        """Initialize OpenAI client."""
+        """Initialize the shared AsyncOpenAI client."""
         if not settings.openai_api_key:
             raise ValueError("OPENAI_API_KEY is not configured")
         
-        self.client = OpenAI(api_key=settings.openai_api_key)
+        self.async_client = _get_async_client()
         self.model = settings.openai_model
     
-    def generate_insights(
+    async def generate_insights_async(
         self,
         metrics: dict[str, Any],
         raw_data_summary: dict[str, Any],
         balance_sheet_date: str,
     ) -> list[dict[str, Any]]:
         """
-        Generate insights using OpenAI.
+        Generate insights using the shared AsyncOpenAI client.
         
         Args:
             metrics: Calculated financial metrics
@@ -50,6 +64,25 @@ class AIInsightService:
             ValueError: If API response is invalid
             Exception: If API call fails
         """
+        request = self._build_insights_request(metrics, raw_data_summary, balance_sheet_date)
+        
+        try:
+            response = await self.async_client.chat.completions.create(**request)
+            return self._parse_insights_response(response)
+        except json.JSONDecodeError as e:
+            logger.error("Failed to parse OpenAI JSON response: %s", e)
+            raise ValueError(f"Invalid JSON response from OpenAI: {e}") from e
+        except Exception as e:
+            logger.error("OpenAI API error: %s", e)
+            raise
+    
+    def _build_insights_request(
+        self,
+        metrics: dict[str, Any],
+        raw_data_summary: dict[str, Any],
+        balance_sheet_date: str,
+    ) -> dict[str, Any]:
+        """Build chat completion arguments for insight generation."""
         # Truncate summary if needed to stay within token limits
         truncated_summary = self._truncate_summary_if_needed(raw_data_summary)
         
@@ -67,51 +100,44 @@ class AIInsightService:
         else:
             logger.info("Estimated input tokens: %d", estimated_tokens)
         
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": self._get_system_prompt(),
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt,
-                    },
-                ],
-                response_format={
-                    "type": "json_schema",
-                    "json_schema": {
-                        "name": "financial_insights",
-                        "strict": True,
-                        "schema": schema,
-                    },
+        return {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": self._get_system_prompt(),
                 },
-                temperature=0.1,
-            )
-            
-            content = response.choices[0].message.content
-            if not content:
-                raise ValueError("Empty response from OpenAI")
-            
-            parsed = json.loads(content)
-            insights = parsed.get("insights", [])
-            
-            if not insights:
-                logger.warning("OpenAI returned no insights")
-                return []
-            
-            # Validate and limit to 3
-            validated_insights = self._validate_insights(insights[:3])
-            return validated_insights
-            
-        except json.JSONDecodeError as e:
-            logger.error("Failed to parse OpenAI JSON response: %s", e)
-            raise ValueError(f"Invalid JSON response from OpenAI: {e}") from e
-        except Exception as e:
-            logger.error("OpenAI API error: %s", e)
-            raise
+                {
+                    "role": "user",
+                    "content": prompt,
+                },
+            ],
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "financial_insights",
+                    "strict": True,
+                    "schema": schema,
+                },
+            },
+            "temperature": 0.1,
+        }
+    
+    def _parse_insights_response(self, response: Any) -> list[dict[str, Any]]:
+        """Parse and validate insights from a chat completion response."""
+        content = response.choices[0].message.content
+        if not content:
+            raise ValueError("Empty response from OpenAI")
+        
+        parsed = json.loads(content)
+        insights = parsed.get("insights", [])
+        
+        if not insights:
+            logger.warning("OpenAI returned no insights")
+            return []
+        
+        # Validate and limit to 3
+        return self._validate_insights(insights[:3])
     
     def _get_system_prompt(self) -> str:
         """Get system prompt with role and guidelines."""
@@ -344,7 +370,7 @@ All fields are required, but supporting_numbers can be [] and data_notes can be
         """
         return int(len(text) * TOKENS_PER_CHAR)
     
-    def _generate_health_score_text(
+    async def _generate_health_score_text_async(
         self,
         health_score: dict[str, Any],
         key_metrics: dict[str, Any],
@@ -352,7 +378,7 @@ All fields are required, but supporting_numbers can be [] and data_notes can be
         calculated_metrics: dict[str, Any] | None = None,
     ) -> dict[str, Any]:
         """
-        Generate descriptive text for health score using OpenAI.
+        Generate descriptive text for health score using the shared AsyncOpenAI client.
         
         Args:
             health_score: Complete health score dictionary
@@ -362,40 +388,13 @@ All fields are required, but supporting_numbers can be [] and data_notes can be
         Returns:
             Dictionary with category_metrics, why_this_matters, and assumptions
         """
-        prompt = self._build_health_score_prompt(health_score, key_metrics, raw_data_summary, calculated_metrics)
-        schema = self._get_health_score_json_schema()
+        request = self._build_health_score_request(
+            health_score, key_metrics, raw_data_summary, calculated_metrics
+        )
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": self._get_health_score_system_prompt(),
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt,
-                    },
-                ],
-                response_format={
-                    "type": "json_schema",
-                    "json_schema": {
-                        "name": "health_score_text",
-                        "strict": True,
-                        "schema": schema,
-                    },
-                },
-                temperature=0.1,
-            )
-            
-            content = response.choices[0].message.content
-            if not content:
-                raise ValueError("Empty response from OpenAI")
-            
-            parsed = json.loads(content)
-            return parsed
-            
+            response = await self.async_client.chat.completions.create(**request)
+            return self._parse_health_score_response(response)
         except json.JSONDecodeError as e:
             logger.error("Failed to parse OpenAI JSON response: %s", e)
             raise ValueError(f"Invalid JSON response from OpenAI: {e}") from e
@@ -403,6 +402,48 @@ All fields are required, but supporting_numbers can be [] and data_notes can be
             logger.error("OpenAI API error: %s", e)
             raise
     
+    def _build_health_score_request(
+        self,
+        health_score: dict[str, Any],
+        key_metrics: dict[str, Any],
+        raw_data_summary: dict[str, Any],
+        calculated_metrics: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Build chat completion arguments for health score text."""
+        prompt = self._build_health_score_prompt(health_score, key_metrics, raw_data_summary, calculated_metrics)
+        schema = self._get_health_score_json_schema()
+        
+        return {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": self._get_health_score_system_prompt(),
+                },
+                {
+                    "role": "user",
+                    "content": prompt,
+                },
+            ],
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "health_score_text",
+                    "strict": True,
+                    "schema": schema,
+                },
+            },
+            "temperature": 0.1,
+        }
+    
+    def _parse_health_score_response(self, response: Any) -> dict[str, Any]:
+        """Parse health score text from a chat completion response."""
+        content = response.choices[0].message.content
+        if not content:
+            raise ValueError("Empty response from OpenAI")
+        
+        return json.loads(content)
+    
     def _get_health_score_system_prompt(self) -> str:
         """Get system prompt for health score text generation."""
         return """You are a financial advisor helping small business owners understand their business health score.
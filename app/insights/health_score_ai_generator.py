@@ -24,7 +24,7 @@ class HealthScoreAIGenerator:
         """Initialize AI insight service."""
         self.ai_service = AIInsightService()
     
-    def generate_descriptive_text(
+    async def generate_descriptive_text_async(
         self,
         health_score: dict[str, Any],
         key_metrics: dict[str, Any],
@@ -32,7 +32,7 @@ class HealthScoreAIGenerator:
         calculated_metrics: dict[str, Any] | None = None,
     ) -> dict[str, Any]:
         """
-        Generate descriptive text for health score using AI.
+        Generate descriptive text for health score without blocking the event loop.
         
         Args:
             health_score: Complete health score dictionary from HealthScoreCalculator
@@ -46,28 +46,33 @@ class HealthScoreAIGenerator:
             - assumptions: Array of assumption strings
         """
         try:
-            result = self.ai_service._generate_health_score_text(
+            result = await self.ai_service._generate_health_score_text_async(
                 health_score=health_score,
                 key_metrics=key_metrics,
                 raw_data_summary=raw_data_summary,
                 calculated_metrics=calculated_metrics,
             )
-            
-            # Validate result structure
-            if not result:
-                logger.warning("AI returned empty result")
-                return {
-                    "category_metrics": {},
-                    "why_this_matters": "",
-                    "assumptions": [],
-                }
-            
-            return result
         except Exception as e:
             logger.error("Failed to generate health score descriptive text: %s", e, exc_info=True)
             # Return empty structure on error (graceful degradation)
-            return {
-                "category_metrics": {},
-                "why_this_matters": "",
-                "assumptions": [],
-            }
+            return self._empty_result()
+        
+        return self._validate_result(result)
+    
+    @staticmethod
+    def _validate_result(result: dict[str, Any]) -> dict[str, Any]:
+        """Validate result structure, falling back to an empty result."""
+        if not result:
+            logger.warning("AI returned empty result")
+            return HealthScoreAIGenerator._empty_result()
+        
+        return result
+    
+    @staticmethod
+    def _empty_result() -> dict[str, Any]:
+        """Build the empty descriptive text structure."""
+        return {
+            "category_metrics": {},
+            "why_this_matters": "",
+            "assumptions": [],
+        }
@@ -261,7 +261,8 @@ class UpcomingCommitmentsCalculator:
     def calculate(
         payables: dict[str, Any],
         cash_position: float,
-        days_ahead: int = 30
+        days_ahead: int = 30,
+        today: Optional[date] = None,
     ) -> dict[str, Any]:
         """
         Calculate upcoming cash commitments.
@@ -270,6 +271,7 @@ class UpcomingCommitmentsCalculator:
             payables: Payables data from XeroDataFetcher
             cash_position: Current cash balance
             days_ahead: Number of days to look ahead (default: 30)
+            today: Reference date (default: date.today())
         
         Returns:
             Dictionary with upcoming commitments metrics
@@ -281,7 +283,8 @@ class UpcomingCommitmentsCalculator:
         if not isinstance(invoices, list):
             invoices = []
         
-        today = date.today()
+        if today is None:
+            today = date.today()
         cutoff_date = today + timedelta(days=days_ahead)
         
         upcoming_amount = 0.0
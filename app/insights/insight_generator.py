@@ -25,14 +25,14 @@ class InsightGenerator:
         """Initialize AI insight service."""
         self.ai_service = AIInsightService()
     
-    def generate_insights(
+    async def generate_insights_async(
         self,
         metrics: dict[str, Any],
         raw_data_summary: dict[str, Any],
         balance_sheet_date: str,
     ) -> list[dict[str, Any]]:
         """
-        Generate insights using AI.
+        Generate insights using AI without blocking the event loop.
         
         Args:
             metrics: Combined financial metrics dictionary
@@ -43,22 +43,24 @@ class InsightGenerator:
             List of insight dictionaries (1-3 items), ranked by urgency
         """
         try:
-            insights = self.ai_service.generate_insights(
+            insights = await self.ai_service.generate_insights_async(
                 metrics=metrics,
                 raw_data_summary=raw_data_summary,
                 balance_sheet_date=balance_sheet_date,
             )
-            
-            # Add insight_id and generated_at to each insight
-            for insight in insights:
-                if "insight_id" not in insight:
-                    insight["insight_id"] = str(uuid.uuid4())
-                if "generated_at" not in insight:
-                    insight["generated_at"] = datetime.now(timezone.utc).isoformat()
-            
-            return insights
+            return self._finalize_insights(insights)
             
         except Exception as e:
             logger.error("Failed to generate AI insights: %s", e, exc_info=True)
             raise
-
+    
+    @staticmethod
+    def _finalize_insights(insights: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Add insight_id and generated_at to each insight."""
+        for insight in insights:
+            if "insight_id" not in insight:
+                insight["insight_id"] = str(uuid.uuid4())
+            if "generated_at" not in insight:
+                insight["generated_at"] = datetime.now(timezone.utc).isoformat()
+        
+        return insights
@@ -52,10 +52,11 @@ class ProfitabilityCalculator:
         if not isinstance(executive_summary_current, dict):
             return "stable"
 
-        all_data = executive_summary_history + [executive_summary_current]
+        # Only the last three months matter; avoid copying the whole history
+        recent_data = [*executive_summary_history[-2:], executive_summary_current]
         net_flows = []
 
-        for month in all_data[-3:]:
+        for month in recent_data:
             if not isinstance(month, dict):
                 continue
             cash_received = safe_float(safe_get(month, "cash_received"), 0.0)
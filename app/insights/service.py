@@ -5,9 +5,10 @@ Orchestrates calculation of financial insights from Xero data.
 Uses Monthly P&L data for revenue/expenses (not Trial Balance).
 """
 
+import asyncio
 import logging
 from datetime import date as date_type
-from typing import Any, Optional
+from typing import Any, Optional, TypedDict
 
 from app.insights.cash_calculators import (
     CashRunwayCalculator,
@@ -22,6 +23,47 @@ from app.integrations.xero.extractors import Extractors
 
 logger = logging.getLogger(__name__)
 
+# Runway statuses that are definitive even without a runway figure
+_DEFINITIVE_RUNWAY_STATUSES = frozenset({"negative", "infinite"})
+
+
+class InsightsResult(TypedDict):
+    """Calculated insights returned by InsightsService."""
+    cash_runway: dict[str, Any]
+    leading_indicators: dict[str, Any]
+    cash_pressure: dict[str, Any]
+    profitability: dict[str, Any]
+    upcoming_commitments: dict[str, Any]
+
+
+def _split_net(net: float) -> tuple[float, float]:
+    """Split a net cash change into (cash_received, cash_spent)."""
+    return (net, 0.0) if net >= 0 else (0.0, -net)
+
+
+def _has_invoices(invoice_data: Optional[dict[str, Any]]) -> bool:
+    """
+    Check whether fetched receivables/payables contain any invoices.
+    
+    The fetcher returns a populated summary dict (zero totals, empty
+    invoice list) even when there are no invoices or the fetch failed,
+    so the dict's truthiness says nothing about its contents.
+    """
+    if not invoice_data:
+        return False
+    return bool(invoice_data.get("count") or invoice_data.get("invoices"))
+
+
+def _missing_data_result() -> InsightsResult:
+    """Build the result returned when there is no data to calculate from."""
+    return {
+        "cash_runway": {"status": "unknown", "error": "missing_data"},
+        "leading_indicators": {},
+        "cash_pressure": {"status": "unknown"},
+        "profitability": {},
+        "upcoming_commitments": {},
+    }
+
 
 class InsightsService:
     """
@@ -85,13 +127,43 @@ class InsightsService:
         }
     
     @staticmethod
-    def calculate_all_insights(
+    def _calculate_cash_runway(
+        cash_current: float,
+        cash_spent: float,
+        cash_received: float,
+        has_pnl_data: bool,
+    ) -> dict[str, Any]:
+        """Calculate cash runway and attach confidence metadata."""
+        cash_runway = CashRunwayCalculator.calculate(
+            cash_position=cash_current,
+            cash_spent=cash_spent,
+            cash_received=cash_received,
+        )
+        cash_runway["confidence_details"] = ["burn_from_monthly_pnl"]
+        
+        # Set confidence level based on data availability
+        if has_pnl_data and (
+            cash_runway["runway_months"] is not None
+            or cash_runway["status"] in _DEFINITIVE_RUNWAY_STATUSES
+        ):
+            cash_runway["confidence_level"] = "High"
+        else:
+            cash_runway["confidence_level"] = "Medium"
+        
+        return cash_runway
+    
+    @staticmethod
+    async def calculate_all_insights_async(
         financial_data: dict[str, Any],
         monthly_pnl_data: Optional[list[dict[str, Any]]] = None,
-    ) -> dict[str, Any]:
+    ) -> InsightsResult:
         """
         Calculate all financial insights from Xero data.
         
+        Cash runway, leading indicators, profitability and upcoming commitments
+        are independent once inputs are extracted, so they run concurrently in
+        worker threads. Cash pressure depends on runway and runs afterwards.
+        
         Args:
             financial_data: Complete data structure from XeroDataFetcher.fetch_all_data()
                            Must include 'extracted' key from Extractors module.
@@ -122,16 +194,25 @@ class InsightsService:
                 )
             else:
                 logger.error("Cannot calculate insights: no account_type_map available")
-                return {
-                    "cash_runway": {"status": "unknown", "error": "missing_data"},
-                    "leading_indicators": {},
-                    "cash_pressure": {"status": "unknown"},
-                    "profitability": {},
-                    "upcoming_commitments": {},
-                }
+                return _missing_data_result()
+        
+        # Get receivables/payables
+        receivables = financial_data.get("invoices_receivable", {})
+        payables = financial_data.get("invoices_payable", {})
         
         # Extract Balance Sheet values
         bs_data = extracted.get("balance_sheet", {})
+        
+        # Nothing to calculate from (e.g. new or disconnected organization)
+        if (
+            bs_data.get("cash") is None
+            and not monthly_pnl_data
+            and not _has_invoices(receivables)
+            and not _has_invoices(payables)
+        ):
+            logger.warning("No balance sheet, invoice or P&L data, skipping calculators")
+            return _missing_data_result()
+        
         cash_current = bs_data.get("cash") or 0.0
         
         # Get P&L values from monthly data (rolling 3-month sum)
@@ -141,85 +222,69 @@ class InsightsService:
         expenses = pnl_aggregated.get("expenses") or 0.0
         
         logger.info(
-            f"P&L from monthly data (3mo): revenue={revenue:.2f}, "
-            f"cogs={cost_of_sales:.2f}, expenses={expenses:.2f}"
+            "P&L from monthly data (3mo): revenue=%.2f, cogs=%.2f, expenses=%.2f",
+            revenue,
+            cost_of_sales,
+            expenses,
         )
         
-        # Get receivables/payables
-        receivables = financial_data.get("invoices_receivable", {})
-        payables = financial_data.get("invoices_payable", {})
-        
-        # Extract prior period cash if available
-        balance_sheet_prior = financial_data.get("balance_sheet_prior", {})
-        account_type_map = financial_data.get("account_type_map", {})
-        
-        cash_prior = 0.0
-        if balance_sheet_prior and account_type_map:
-            prior_bs = Extractors.extract_balance_sheet(balance_sheet_prior, account_type_map)
-            cash_prior = prior_bs.get("cash") or 0.0
-        
         # Calculate net profit and derive burn rate
         net_profit = revenue - cost_of_sales - expenses
-        if net_profit >= 0:
-            cash_spent = 0.0
-            cash_received = net_profit
-        else:
-            cash_spent = abs(net_profit)
-            cash_received = 0.0
+        cash_received, cash_spent = _split_net(net_profit)
         
-        # Calculate cash runway
-        cash_runway = CashRunwayCalculator.calculate(
-            cash_position=cash_current,
-            cash_spent=cash_spent,
-            cash_received=cash_received,
-        )
-        cash_runway["confidence_details"] = ["burn_from_monthly_pnl"]
+        has_pnl_data = bool(monthly_pnl_data) and len(monthly_pnl_data) >= 3
         
-        # Set confidence level based on data availability
-        runway_months = cash_runway.get("runway_months")
-        status = cash_runway.get("status") or ""
-        has_pnl_data = monthly_pnl_data and len(monthly_pnl_data) >= 3
-        
-        if has_pnl_data and (runway_months is not None or status in ("negative", "infinite")):
-            cash_runway["confidence_level"] = "High"
-        else:
-            cash_runway["confidence_level"] = "Medium"
+        today = date_type.today()
         
         # Build executive summary for other calculators
         executive_summary = {
             "cash_position": cash_current,
             "cash_spent": cash_spent,
             "cash_received": cash_received,
-            "report_date": date_type.today(),
+            "report_date": today,
         }
         
-        # Calculate leading indicators
-        leading_indicators = LeadingIndicatorsCalculator.calculate(
-            receivables=receivables,
-            payables=payables,
-            executive_summary_current=executive_summary,
-            executive_summary_history=[],
+        # Run independent calculators concurrently
+        (
+            cash_runway,
+            leading_indicators,
+            profitability,
+            upcoming_commitments,
+        ) = await asyncio.gather(
+            asyncio.to_thread(
+                InsightsService._calculate_cash_runway,
+                cash_current,
+                cash_spent,
+                cash_received,
+                has_pnl_data,
+            ),
+            asyncio.to_thread(
+                LeadingIndicatorsCalculator.calculate,
+                receivables=receivables,
+                payables=payables,
+                executive_summary_current=executive_summary,
+                executive_summary_history=[],
+            ),
+            asyncio.to_thread(
+                ProfitabilityCalculator.calculate,
+                revenue=revenue,
+                cost_of_sales=cost_of_sales,
+                expenses=expenses,
+                executive_summary_current=executive_summary,
+                executive_summary_history=[],
+            ),
+            asyncio.to_thread(
+                UpcomingCommitmentsCalculator.calculate,
+                payables=payables,
+                cash_position=cash_current,
+                today=today,
+            ),
         )
         
-        # Calculate cash pressure
+        # Calculate cash pressure (depends on runway)
         cash_pressure = InsightsService.calculate_cash_pressure(cash_runway)
         cash_pressure["confidence_details"] = ["derived_from_runway"]
         
-        # Calculate profitability using monthly P&L data
-        profitability = ProfitabilityCalculator.calculate(
-            revenue=revenue,
-            cost_of_sales=cost_of_sales,
-            expenses=expenses,
-            executive_summary_current=executive_summary,
-            executive_summary_history=[],
-        )
-        
-        # Calculate upcoming commitments
-        upcoming_commitments = UpcomingCommitmentsCalculator.calculate(
-            payables=payables,
-            cash_position=cash_current,
-        )
-        
         return {
             "cash_runway": cash_runway,
             "leading_indicators": leading_indicators,
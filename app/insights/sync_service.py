@@ -3,15 +3,20 @@ Sync Service
 Manages the asynchronous synchronization process and state updates.
 """
 
+import asyncio
+import hashlib
 import logging
-from datetime import date, datetime, timezone
-import traceback
-from typing import Optional
+from datetime import date, datetime, time, timezone
+from typing import Any, Optional
 from uuid import UUID
 
-from sqlalchemy import select, and_
+import orjson
+from pydantic import BaseModel
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.models.organization import Organization, SyncStatus, SyncStep
 from app.integrations.xero.data_fetcher import XeroDataFetcher
 from app.integrations.xero.sdk_client import create_xero_sdk_client
@@ -20,6 +25,7 @@ from app.integrations.xero.extractors import Extractors
 from app.insights.service import InsightsService
 from app.insights.data_summarizer import DataSummarizer
 from app.insights.insight_generator import InsightGenerator
+from app.insights.ai_insight_service import PROMPT_VERSION
 from app.insights.health_score_calculator import HealthScoreCalculator
 from app.models.insight import Insight as InsightModel
 from app.models.calculated_metrics import CalculatedMetrics
@@ -33,6 +39,68 @@ from app.insights.schemas import (
 
 logger = logging.getLogger(__name__)
 
+# Insight columns refreshed when a regenerated insight already exists
+_INSIGHT_CONTENT_FIELDS = (
+    "title",
+    "severity",
+    "confidence_level",
+    "summary",
+    "why_it_matters",
+    "recommended_actions",
+    "supporting_numbers",
+    "data_notes",
+    "generated_at",
+)
+
+# Hardcoded Category A health score items, shown ahead of the AI text
+_HARDCODED_A_TEMPLATES = (
+    "Current cash balance of ${cash:,.0f} across all connected accounts",
+    "Average monthly outflows of ${burn:,.0f} over {period}",
+)
+
+
+def _serialize_metric(
+    metric_dict: Optional[dict[str, Any]],
+    model_class: type[BaseModel],
+) -> Optional[dict[str, Any]]:
+    """
+    Validate a metric dict against its schema model and serialize it.
+    
+    This ensures stored payloads are consistent with the API schema.
+    Falls back to the dict as-is if validation fails.
+    """
+    if not metric_dict:
+        return None
+    try:
+        return model_class.model_validate(metric_dict).model_dump(mode="json")
+    except Exception as e:
+        logger.warning("Failed to serialize %s: %s, using dict as-is", model_class.__name__, e)
+        return metric_dict
+
+
+def _compute_inputs_hash(
+    metrics_payload: dict[str, Any],
+    raw_data_summary: dict[str, Any],
+    health_score: Optional[dict[str, Any]],
+) -> str:
+    """
+    Hash the inputs that feed AI generation.
+    
+    Includes the OpenAI model and prompt version, so a model or prompt
+    change regenerates output even when the data is unchanged. The health
+    score's generated_at timestamp is excluded so that re-syncing unchanged
+    data produces the same hash.
+    """
+    if health_score is not None:
+        health_score = {k: v for k, v in health_score.items() if k != "generated_at"}
+    
+    serialized = orjson.dumps(
+        [settings.openai_model, PROMPT_VERSION, metrics_payload, raw_data_summary, health_score],
+        default=str,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+    )
+    return hashlib.sha256(serialized).hexdigest()
+
 
 class SyncService:
     """
@@ -50,26 +118,107 @@ class SyncService:
         self.db = db
         self.organization_id = organization_id
 
-    async def _update_status(self, status: SyncStatus, step: Optional[SyncStep] = None, error: Optional[str] = None):
-        """Helper to update organization sync status."""
+    async def _update_status(
+        self,
+        status: SyncStatus,
+        step: Optional[SyncStep] = None,
+        error: Optional[str] = None,
+        commit: bool = True,
+    ):
+        """
+        Helper to update organization sync status.
+        
+        With commit=False the update joins the current transaction, is
+        committed by the caller, and errors propagate.
+        """
+        values = {"sync_status": status}
+        if step:
+            values["sync_step"] = step
+        if error:
+            values["last_sync_error"] = error
+        
+        stmt = (
+            update(Organization)
+            .where(Organization.id == self.organization_id)
+            .values(**values)
+        )
+        if not commit:
+            await self.db.execute(stmt)
+            return
+        
         try:
-            stmt = select(Organization).where(Organization.id == self.organization_id)
-            result = await self.db.execute(stmt)
-            org = result.scalar_one_or_none()
-            
-            if org:
-                org.sync_status = status
-                if step:
-                    org.sync_step = step
-                if error:
-                    org.last_sync_error = error
-                
-                await self.db.commit()
-                # logger.info(f"Updated Organization {self.organization_id} status to {status}/{step}")
+            await self.db.execute(stmt)
+            await self.db.commit()
         except Exception as e:
-            logger.error(f"Failed to update sync status: {e}")
+            logger.exception("Failed to update sync status: %s", e)
             await self.db.rollback()
 
+    @staticmethod
+    def _calculate_health_score(
+        financial_data: dict[str, Any],
+        monthly_pnl_data: Optional[list[dict[str, Any]]],
+        balance_sheet_date: date,
+        months_with_data: int,
+        generated_at: datetime,
+    ) -> tuple[Optional[dict[str, Any]], list[str]]:
+        """
+        Calculate the deterministic health score and hardcoded Category A items.
+        
+        Args:
+            financial_data: Data from XeroDataFetcher.fetch_all_data()
+            monthly_pnl_data: Extracted monthly P&L totals (newest first)
+            balance_sheet_date: Balance sheet as-of date
+            months_with_data: Number of P&L months with data
+            generated_at: Timestamp of the sync run
+        
+        Returns:
+            Tuple of (health score or None on failure, Category A items)
+        """
+        try:
+            extracted = financial_data.get("extracted", {})
+            balance_sheet_totals = extracted.get("balance_sheet", {})
+            invoices_receivable = financial_data.get("invoices_receivable", {})
+            invoices_payable = financial_data.get("invoices_payable", {})
+            
+            health_score = HealthScoreCalculator.calculate(
+                balance_sheet_totals=balance_sheet_totals,
+                invoices_receivable=invoices_receivable,
+                invoices_payable=invoices_payable,
+                monthly_pnl_data=monthly_pnl_data,
+            )
+            
+            # Add metadata
+            health_score["generated_at"] = generated_at.isoformat()
+            health_score["periods"] = {
+                "balance_sheet_asof": balance_sheet_date.isoformat(),
+                "monthly_pnl": {
+                    "months_fetched": len(monthly_pnl_data) if monthly_pnl_data else 0,
+                    "months_with_data": months_with_data,
+                },
+            }
+            
+            # Generate 2 hardcoded items for Category A
+            key_metrics = health_score.get("key_metrics", {})
+            cash = key_metrics.get("current_cash", 0)
+            burn = key_metrics.get("monthly_burn", 0)
+            period = key_metrics.get("period_label", "the past 90 days").lower()
+            hardcoded_a = [
+                template.format(cash=cash, burn=burn, period=period)
+                for template in _HARDCODED_A_TEMPLATES
+            ]
+            
+            logger.info(
+                "Health Score calculated: score=%s, grade=%s, confidence=%s",
+                health_score["scorecard"]["final_score"],
+                health_score["scorecard"]["grade"],
+                health_score["scorecard"]["confidence"],
+            )
+        except Exception as e:
+            logger.warning("Failed to calculate health score during sync: %s", e)
+            return None, []
+        
+        return health_score, hardcoded_a
+
     async def run_sync(self, balance_sheet_date: date, force_refresh: bool = False):
         """
         Main entry point for the background task.
@@ -85,6 +234,10 @@ class SyncService:
         
         Note: Status is already set to IN_PROGRESS/CONNECTING by the trigger endpoint.
         """
+        # Single timestamp for everything this run produces, so metrics,
+        # health score and insights from one sync share the same time
+        run_started_at = datetime.now(timezone.utc)
+        
         try:
             # Setup Xero Client
             cache_service = CacheService(self.db)
@@ -114,88 +267,147 @@ class SyncService:
             account_map = financial_data.get("account_type_map", {})
             
             monthly_pnl_data = None
-            try:
-                monthly_pnl_raw = await data_fetcher.orchestrator.fetch_monthly_pnl_with_cache(
-                    organization_id=self.organization_id,
-                    account_map=account_map,  # Pass account_map for cache extraction
-                    num_months=12,
-                    force_refresh=force_refresh,
-                )
-                
-                # Extract P&L totals from monthly data
-                if monthly_pnl_raw and account_map:
-                    monthly_pnl_data = Extractors.extract_monthly_pnl_totals(
-                        monthly_pnl_raw,
-                        account_map,
+            months_with_data = 0
+            if not account_map:
+                # P&L totals can't be extracted without the account map, so
+                # don't spend a Xero request fetching them
+                logger.warning("No account map available, skipping monthly P&L fetch")
+            else:
+                try:
+                    monthly_pnl_raw = await data_fetcher.orchestrator.fetch_monthly_pnl_with_cache(
+                        organization_id=self.organization_id,
+                        account_map=account_map,  # Pass account_map for cache extraction
+                        num_months=12,
+                        force_refresh=force_refresh,
                     )
-                    # Log how many months have actual data
-                    months_with_data = sum(1 for m in monthly_pnl_data if m.get("has_data"))
-                    logger.info(f"Extracted P&L: {months_with_data} months with data out of {len(monthly_pnl_data)} fetched")
-            except Exception as e:
-                logger.warning(f"Failed to fetch monthly P&L: {e}")
-                monthly_pnl_data = None
+                    
+                    # Extract P&L totals from monthly data
+                    if monthly_pnl_raw:
+                        monthly_pnl_data = Extractors.extract_monthly_pnl_totals(
+                            monthly_pnl_raw,
+                            account_map,
+                        )
+                        # Log how many months have actual data
+                        months_with_data = sum(1 for m in monthly_pnl_data if m.get("has_data"))
+                        logger.info(
+                            "Extracted P&L: %d months with data out of %d fetched",
+                            months_with_data,
+                            len(monthly_pnl_data),
+                        )
+                except Exception as e:
+                    logger.warning("Failed to fetch monthly P&L: %s", e)
+                    monthly_pnl_data = None
+                    months_with_data = 0
+            
+            # Calculate Metrics, data summary and Health Score
+            # These are CPU-bound and independent, so run them in worker
+            # threads to keep the event loop free for other requests
+            metrics, raw_data_summary, (health_score, hardcoded_a) = await asyncio.gather(
+                InsightsService.calculate_all_insights_async(financial_data, monthly_pnl_data),
+                asyncio.to_thread(
+                    DataSummarizer.summarize,
+                    financial_data,
+                    balance_sheet_date,
+                    monthly_pnl_data,
+                ),
+                asyncio.to_thread(
+                    self._calculate_health_score,
+                    financial_data,
+                    monthly_pnl_data,
+                    balance_sheet_date,
+                    months_with_data,
+                    run_started_at,
+                ),
+            )
             
-            # Calculate Metrics
-            metrics = InsightsService.calculate_all_insights(financial_data, monthly_pnl_data)
-            raw_data_summary = DataSummarizer.summarize(financial_data, balance_sheet_date, monthly_pnl_data)
+            # Descriptive text needs the category breakdown; without it the
+            # OpenAI round-trip would be wasted
+            wants_health_text = bool(
+                health_score and health_score.get("category_scores", {}).get("A")
+            )
 
-            # Calculate Health Score
-            health_score_payload = None
-            try:
-                extracted = financial_data.get("extracted", {})
-                balance_sheet_totals = extracted.get("balance_sheet", {})
-                invoices_receivable = financial_data.get("invoices_receivable", {})
-                invoices_payable = financial_data.get("invoices_payable", {})
-                
-                health_score = HealthScoreCalculator.calculate(
-                    balance_sheet_totals=balance_sheet_totals,
-                    invoices_receivable=invoices_receivable,
-                    invoices_payable=invoices_payable,
-                    monthly_pnl_data=monthly_pnl_data,
-                )
-                
-                # Add metadata
-                months_with_data = sum(1 for m in (monthly_pnl_data or []) if m.get("has_data"))
-                health_score["generated_at"] = datetime.now(timezone.utc).isoformat()
-                health_score["periods"] = {
-                    "balance_sheet_asof": balance_sheet_date.isoformat(),
-                    "monthly_pnl": {
-                        "months_fetched": len(monthly_pnl_data) if monthly_pnl_data else 0,
-                        "months_with_data": months_with_data,
-                    },
-                }
-                
-                # Generate AI descriptive text (during sync, not fetch)
+            # Build the metrics snapshot (also used to detect unchanged inputs)
+            # Validate against the API schema models, then serialize for storage
+            metrics_payload = {
+                "cash_runway": _serialize_metric(metrics.get("cash_runway"), CashRunwayMetrics),
+                "cash_pressure": _serialize_metric(metrics.get("cash_pressure"), CashPressureMetrics),
+                "leading_indicators": _serialize_metric(metrics.get("leading_indicators"), LeadingIndicatorsMetrics),
+                "profitability": _serialize_metric(metrics.get("profitability"), ProfitabilityMetrics),
+                "upcoming_commitments": _serialize_metric(metrics.get("upcoming_commitments"), UpcomingCommitmentsMetrics),
+            }
+            
+            data_period_end = datetime.combine(balance_sheet_date, time.min, tzinfo=timezone.utc)
+            
+            stmt = select(CalculatedMetrics).where(CalculatedMetrics.organization_id == self.organization_id)
+            result = await self.db.execute(stmt)
+            calc_metrics = result.scalar_one_or_none()
+            
+            # Skip AI generation when the inputs match the last complete sync
+            inputs_hash = _compute_inputs_hash(metrics_payload, raw_data_summary, health_score)
+            if (
+                not force_refresh
+                and calc_metrics is not None
+                and calc_metrics.last_inputs_hash == inputs_hash
+            ):
+                logger.info("Sync inputs unchanged, reusing stored health score and insights")
+                calc_metrics.calculated_at = run_started_at
+                calc_metrics.data_period_end = data_period_end
+                await self._update_status(SyncStatus.COMPLETED, SyncStep.COMPLETED, commit=False)
+                await self.db.commit()
+                return
+
+            # 5. Generate AI Insights and health score text (The Slow Part)
+            # This status commit also ends the session's transaction, which returns
+            # its connection to the pool for the duration of the OpenAI calls. No
+            # SQL may be issued until they finish; calc_metrics stays usable since
+            # the session does not expire objects on commit.
+            await self._update_status(SyncStatus.IN_PROGRESS, SyncStep.GENERATING_INSIGHTS)
+            
+            # Both are independent OpenAI calls, so await them concurrently
+            async def _generate_text():
+                """Generate health score descriptive text, or None if skipped or failed."""
+                if not wants_health_text:
+                    return None
                 try:
                     from app.insights.health_score_ai_generator import HealthScoreAIGenerator
                     
-                    # Generate 2 hardcoded items for Category A
-                    key_metrics = health_score.get("key_metrics", {})
-                    cash = key_metrics.get("current_cash", 0)
-                    burn = key_metrics.get("monthly_burn", 0)
-                    period = key_metrics.get("period_label", "the past 90 days").lower()
-                    hardcoded_a = [
-                        f"Current cash balance of ${cash:,.0f} across all connected accounts",
-                        f"Average monthly outflows of ${burn:,.0f} over {period}"
-                    ]
-                    
-                    # Run AI generation in executor (blocking call)
-                    import asyncio
-                    loop = asyncio.get_running_loop()
-                    
-                    def _generate_text():
-                        generator = HealthScoreAIGenerator()
-                        return generator.generate_descriptive_text(
-                            health_score=health_score,
-                            key_metrics=key_metrics,
-                            raw_data_summary=raw_data_summary,
-                            calculated_metrics=metrics,
-                        )
-                    
-                    ai_text = await loop.run_in_executor(None, _generate_text)
-                    
-                    # Merge AI-generated text into health score
-                    if ai_text.get("category_metrics"):
+                    generator = HealthScoreAIGenerator()
+                    return await generator.generate_descriptive_text_async(
+                        health_score=health_score,
+                        key_metrics=health_score.get("key_metrics", {}),
+                        raw_data_summary=raw_data_summary,
+                        calculated_metrics=metrics,
+                    )
+                except Exception as e:
+                    logger.warning("Failed to generate AI descriptive text for health score: %s", e)
+                    return None
+            
+            async def _generate():
+                insight_generator = InsightGenerator()
+                return await insight_generator.generate_insights_async(
+                    metrics={
+                        "cash_runway": metrics["cash_runway"],
+                        "cash_pressure": metrics["cash_pressure"],
+                        "leading_indicators": metrics["leading_indicators"],
+                        "profitability": metrics["profitability"],
+                        "upcoming_commitments": metrics["upcoming_commitments"],
+                    },
+                    raw_data_summary=raw_data_summary,
+                    balance_sheet_date=balance_sheet_date.isoformat(),
+                )
+            
+            # An insight failure is re-raised after the metrics snapshot is saved
+            ai_text, generated_insights = await asyncio.gather(
+                _generate_text(),
+                _generate(),
+                return_exceptions=True,
+            )
+            
+            # Merge AI-generated text into health score
+            health_score_payload = None
+            if health_score is not None:
+                try:
+                    if ai_text and ai_text.get("category_metrics"):
                         for category_id, category_metrics_list in ai_text["category_metrics"].items():
                             if category_id in health_score["category_scores"]:
                                 # Prepend hardcoded items for Category A
@@ -203,151 +415,93 @@ class SyncService:
                                     health_score["category_scores"][category_id]["metrics"] = hardcoded_a + category_metrics_list
                                 else:
                                     health_score["category_scores"][category_id]["metrics"] = category_metrics_list
-                    else:
+                    elif wants_health_text:
                         health_score["category_scores"]["A"]["metrics"] = hardcoded_a
                     
-                    if ai_text.get("why_this_matters"):
+                    if ai_text and ai_text.get("why_this_matters"):
                         health_score["why_this_matters"] = ai_text["why_this_matters"]
                     
-                    if ai_text.get("assumptions"):
+                    if ai_text and ai_text.get("assumptions"):
                         health_score["assumptions"] = ai_text["assumptions"]
                 except Exception as e:
-                    logger.warning(f"Failed to generate AI descriptive text for health score: {e}")
-                    health_score["category_scores"]["A"]["metrics"] = hardcoded_a
+                    logger.warning("Failed to merge AI descriptive text into health score: %s", e)
+                    if wants_health_text:
+                        health_score["category_scores"]["A"]["metrics"] = hardcoded_a
                 
                 health_score_payload = health_score
-                logger.info(
-                    f"Health Score calculated: score={health_score['scorecard']['final_score']}, "
-                    f"grade={health_score['scorecard']['grade']}, "
-                    f"confidence={health_score['scorecard']['confidence']}"
-                )
-            except Exception as e:
-                logger.warning(f"Failed to calculate health score during sync: {e}")
-                health_score_payload = None
 
             # Persist Metrics Snapshot
             # This allows the dashboard to load without re-fetching Xero data
-            generated_at = datetime.now(timezone.utc)
-            
-            # Convert dictionaries to Pydantic models, then serialize for storage
-            # This validates the structure and ensures consistency with the API schema
-            def serialize_metric(metric_dict, model_class):
-                """Convert metric dict to Pydantic model and serialize."""
-                if not metric_dict:
-                    return None
-                try:
-                    return model_class(**metric_dict).model_dump()
-                except Exception as e:
-                    logger.warning(f"Failed to serialize {model_class.__name__}: {e}, using dict as-is")
-                    return metric_dict
-            
-            metrics_payload = {
-                "cash_runway": serialize_metric(metrics.get("cash_runway"), CashRunwayMetrics),
-                "cash_pressure": serialize_metric(metrics.get("cash_pressure"), CashPressureMetrics),
-                "leading_indicators": serialize_metric(metrics.get("leading_indicators"), LeadingIndicatorsMetrics),
-                "profitability": serialize_metric(metrics.get("profitability"), ProfitabilityMetrics),
-                "upcoming_commitments": serialize_metric(metrics.get("upcoming_commitments"), UpcomingCommitmentsMetrics),
-            }
-            
-            stmt = select(CalculatedMetrics).where(CalculatedMetrics.organization_id == self.organization_id)
-            result = await self.db.execute(stmt)
-            calc_metrics = result.scalar_one_or_none()
-            
             if calc_metrics:
                 # Update existing
                 calc_metrics.metrics_payload = metrics_payload
                 calc_metrics.health_score_payload = health_score_payload
-                calc_metrics.calculated_at = generated_at
-                calc_metrics.data_period_end = datetime.combine(balance_sheet_date, datetime.min.time()).replace(tzinfo=timezone.utc)
+                calc_metrics.calculated_at = run_started_at
+                calc_metrics.data_period_end = data_period_end
+                # Cleared until insights are saved, so a failed run is retried
+                calc_metrics.last_inputs_hash = None
             else:
                 # Create new
                 calc_metrics = CalculatedMetrics(
                     organization_id=self.organization_id,
                     metrics_payload=metrics_payload,
                     health_score_payload=health_score_payload,
-                    calculated_at=generated_at,
-                    data_period_end=datetime.combine(balance_sheet_date, datetime.min.time()).replace(tzinfo=timezone.utc),
+                    calculated_at=run_started_at,
+                    data_period_end=data_period_end,
                 )
                 self.db.add(calc_metrics)
-                
-            await self.db.commit()
-
-            # 5. Generate AI Insights (The Slow Part)
-            await self._update_status(SyncStatus.IN_PROGRESS, SyncStep.GENERATING_INSIGHTS)
-            
-            # Run blocking AI call in a thread if possible, but for now just calling it directly 
-            # as this whole run_sync is referenced in BackgroundTasks, so it is already async from the API perspective.
-            # However, since generate_insights uses requests/sync client, it keeps the event loop blocked.
-            # ideally we wrap this in run_in_executor to avoid blocking the MAIN event loop if using uvicorn workers.
-            
-            # Since OpenAI client is sync, we should use run_in_executor
-            import asyncio
-            loop = asyncio.get_running_loop()
             
-            insight_generator = InsightGenerator()
-            
-            # Wrapper for the sync call
-            def _generate():
-                return insight_generator.generate_insights(
-                    metrics={
-                        "cash_runway": metrics["cash_runway"],
-                        "cash_pressure": metrics["cash_pressure"],
-                        "leading_indicators": metrics["leading_indicators"],
-                        "profitability": metrics["profitability"],
-                        "upcoming_commitments": metrics["upcoming_commitments"],
-                    },
-                    raw_data_summary=raw_data_summary,
-                    balance_sheet_date=balance_sheet_date.isoformat(),
-                )
-
-            generated_insights = await loop.run_in_executor(None, _generate)
+            if isinstance(generated_insights, BaseException):
+                # Keep the metrics snapshot even though insights failed
+                await self.db.commit()
+                raise generated_insights
 
-            # 6. Save Insights
-            generated_at = datetime.now(timezone.utc)
-            for insight_dict in generated_insights:
-                # Upsert Logic
-                stmt = select(InsightModel).where(
-                    and_(
-                        InsightModel.insight_id == insight_dict["insight_id"],
-                        InsightModel.organization_id == self.organization_id,
-                    )
+            # 6. Save Insights (single upsert instead of a SELECT per insight)
+            if generated_insights:
+                rows = [
+                    {
+                        "organization_id": self.organization_id,
+                        "insight_id": insight_dict["insight_id"],
+                        "insight_type": insight_dict["insight_type"],
+                        "title": insight_dict["title"],
+                        "severity": insight_dict["severity"],
+                        "confidence_level": insight_dict["confidence_level"],
+                        "summary": insight_dict["summary"],
+                        "why_it_matters": insight_dict["why_it_matters"],
+                        "recommended_actions": insight_dict["recommended_actions"],
+                        "supporting_numbers": insight_dict.get("supporting_numbers", []),
+                        "data_notes": insight_dict.get("data_notes"),
+                        "generated_at": run_started_at,
+                    }
+                    for insight_dict in generated_insights
+                ]
+                insert_stmt = pg_insert(InsightModel).values(rows)
+                # Only refresh generated content; engagement fields are left untouched
+                upsert_stmt = insert_stmt.on_conflict_do_update(
+                    index_elements=[InsightModel.organization_id, InsightModel.insight_id],
+                    set_={
+                        **{
+                            field: insert_stmt.excluded[field]
+                            for field in _INSIGHT_CONTENT_FIELDS
+                        },
+                        "updated_at": func.now(),
+                    },
                 )
-                result = await self.db.execute(stmt)
-                existing = result.scalar_one_or_none()
-
-                if existing:
-                    existing.title = insight_dict["title"]
-                    existing.severity = insight_dict["severity"]
-                    existing.confidence_level = insight_dict["confidence_level"]
-                    existing.summary = insight_dict["summary"]
-                    existing.why_it_matters = insight_dict["why_it_matters"]
-                    existing.recommended_actions = insight_dict["recommended_actions"]
-                    existing.supporting_numbers = insight_dict.get("supporting_numbers", [])
-                    existing.data_notes = insight_dict.get("data_notes")
-                    existing.generated_at = generated_at
-                else:
-                    new_insight = InsightModel(
-                        organization_id=self.organization_id,
-                        insight_id=insight_dict["insight_id"],
-                        insight_type=insight_dict["insight_type"],
-                        title=insight_dict["title"],
-                        severity=insight_dict["severity"],
-                        confidence_level=insight_dict["confidence_level"],
-                        summary=insight_dict["summary"],
-                        why_it_matters=insight_dict["why_it_matters"],
-                        recommended_actions=insight_dict["recommended_actions"],
-                        supporting_numbers=insight_dict.get("supporting_numbers", []),
-                        data_notes=insight_dict.get("data_notes"),
-                        generated_at=generated_at,
-                    )
-                    self.db.add(new_insight)
+                await self.db.execute(upsert_stmt)
+            
+            # Record the inputs only once AI output is complete, so empty or
+            # failed generations are retried on the next sync
+            if generated_insights and (
+                not wants_health_text or (ai_text and ai_text.get("category_metrics"))
+            ):
+                calc_metrics.last_inputs_hash = inputs_hash
             
+            # 7. Complete: metrics, insights and final status in one transaction
+            await self._update_status(SyncStatus.COMPLETED, SyncStep.COMPLETED, commit=False)
             await self.db.commit()
 
-            # 7. Complete
-            await self._update_status(SyncStatus.COMPLETED, SyncStep.COMPLETED)
-
         except Exception as e:
-            logger.error(f"Sync process failed: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception("Sync process failed: %s", e)
+            # Discard any half-written transaction before recording the failure
+            await self.db.rollback()
             await self._update_status(SyncStatus.FAILED, error=str(e))
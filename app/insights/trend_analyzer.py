@@ -2,17 +2,83 @@
 Trend analysis calculator for cash flow patterns.
 """
 
+import calendar
 import logging
-from datetime import date, timedelta
-from statistics import mean, stdev
-from statistics import StatisticsError
+import math
+from datetime import date
+from functools import lru_cache
 from typing import Any, Optional
 
-from app.insights.utils import safe_float, safe_get, safe_list_get
+from app.insights.utils import safe_float, safe_get
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=512)
+def _is_partial_month_on(report_date_str: str, today: date) -> bool:
+    """
+    Check if a report date represents a partial month as of a given day.
+    
+    Cached on (report_date_str, today), so results roll over at midnight.
+    
+    Args:
+        report_date_str: Report date as ISO string (YYYY-MM-DD)
+        today: Current date
+        
+    Returns:
+        True if partial month, False otherwise
+    """
+    try:
+        report_date = date.fromisoformat(report_date_str)
+    except ValueError:
+        return False
+    
+    # If it's the current month and less than 7 days have elapsed
+    if report_date.year == today.year and report_date.month == today.month:
+        days_elapsed = today.day
+        if days_elapsed < 7:
+            return True
+    
+    # Check if it's a month-end date (last day of month)
+    # If not month-end, it's likely partial
+    days_in_month = calendar.monthrange(report_date.year, report_date.month)[1]
+    return report_date.day != days_in_month
+
+
+@lru_cache(maxsize=512)
+def _partial_month_span(report_date_str: str, today: date) -> Optional[tuple[int, int]]:
+    """
+    Get the (days_elapsed, days_in_month) span used to project a partial month.
+    
+    Cached on (report_date_str, today); the value being projected is kept
+    out of the key so every metric for a month shares one entry.
+    
+    Args:
+        report_date_str: Report date as ISO string (YYYY-MM-DD)
+        today: Current date
+        
+    Returns:
+        Tuple of (days_elapsed, days_in_month), or None if the month is not
+        partial or the date is invalid
+    """
+    if not _is_partial_month_on(report_date_str, today):
+        return None
+    
+    report_date = date.fromisoformat(report_date_str)
+    
+    # Calculate days elapsed in current month
+    if report_date.year == today.year and report_date.month == today.month:
+        days_elapsed = today.day
+    else:
+        # For historical partial months, estimate based on report date
+        days_elapsed = report_date.day
+    
+    # Calculate days in month
+    days_in_month = calendar.monthrange(report_date.year, report_date.month)[1]
+    
+    return days_elapsed, days_in_month
+
+
 class TrendAnalyzer:
     """
     Analyzes trends in cash flow over time.
@@ -57,8 +123,9 @@ class TrendAnalyzer:
         if not isinstance(historical_data, list) or len(historical_data) < 2:
             return None
         
-        current_month = safe_list_get(historical_data, -1, {})
-        previous_month = safe_list_get(historical_data, -2, {})
+        # Length is checked above, so index directly
+        current_month = historical_data[-1]
+        previous_month = historical_data[-2]
         
         if not isinstance(current_month, dict) or not isinstance(previous_month, dict):
             return None
@@ -101,15 +168,16 @@ class TrendAnalyzer:
         if not cash_received_values or len(cash_received_values) < 2:
             return None
         
-        try:
-            mean_value = mean(cash_received_values)
-            if mean_value == 0:
-                return None
-            std_dev = stdev(cash_received_values)
-            coefficient_of_variation = (std_dev / abs(mean_value)) * 100
-            return float(coefficient_of_variation)
-        except (ValueError, TypeError, ZeroDivisionError, StatisticsError):
+        # Two-pass sample mean/stdev with fsum (statistics.mean/stdev use
+        # exact Fraction arithmetic, which is far slower for plain floats)
+        n = len(cash_received_values)
+        mean_value = math.fsum(cash_received_values) / n
+        if mean_value == 0:
             return None
+        variance = math.fsum((x - mean_value) ** 2 for x in cash_received_values) / (n - 1)
+        std_dev = math.sqrt(variance)
+        coefficient_of_variation = (std_dev / abs(mean_value)) * 100
+        return float(coefficient_of_variation)
     
     @staticmethod
     def calculate_net_cash_flow_trend(
@@ -127,19 +195,22 @@ class TrendAnalyzer:
         if not isinstance(historical_data, list) or len(historical_data) < 2:
             return "stable"
         
+        # Only the two most recent valid months matter, so walk back from the end
         net_flows = []
-        for month in historical_data:
+        for month in reversed(historical_data):
             if not isinstance(month, dict):
                 continue
             cash_received = safe_float(safe_get(month, "cash_received"), 0.0)
             cash_spent = safe_float(safe_get(month, "cash_spent"), 0.0)
-            net_flow = cash_received - cash_spent
-            net_flows.append(net_flow)
+            net_flows.append(cash_received - cash_spent)
+            if len(net_flows) == 2:
+                break
         
         if len(net_flows) < 2:
             return "stable"
         
-        recent_trend = net_flows[-1] - net_flows[-2]
+        # net_flows is newest first
+        recent_trend = net_flows[0] - net_flows[1]
         
         if recent_trend > 0:
             return "improving"
@@ -163,31 +234,10 @@ class TrendAnalyzer:
         Returns:
             True if partial month, False otherwise
         """
-        if not report_date_str:
+        if not report_date_str or not isinstance(report_date_str, str):
             return False
         
-        try:
-            report_date = date.fromisoformat(report_date_str)
-            today = date.today()
-            
-            # If it's the current month and less than 7 days have elapsed
-            if report_date.year == today.year and report_date.month == today.month:
-                days_elapsed = today.day
-                if days_elapsed < 7:
-                    return True
-            
-            # Check if it's a month-end date (last day of month)
-            # If not month-end, it's likely partial
-            if report_date.month == 12:
-                expected_end = date(report_date.year, 12, 31)
-            else:
-                expected_end = date(report_date.year, report_date.month + 1, 1)
-                expected_end = expected_end - timedelta(days=1)
-            
-            return report_date != expected_end
-            
-        except (ValueError, TypeError):
-            return False
+        return _is_partial_month_on(report_date_str, date.today())
     
     @staticmethod
     def _normalize_for_partial_month(
@@ -206,36 +256,18 @@ class TrendAnalyzer:
         Returns:
             Normalized value or None if normalization not applicable
         """
-        if not TrendAnalyzer._is_partial_month(report_date_str):
+        if not report_date_str or not isinstance(report_date_str, str):
             return None
         
-        try:
-            report_date = date.fromisoformat(report_date_str)
-            today = date.today()
-            
-            # Calculate days elapsed in current month
-            if report_date.year == today.year and report_date.month == today.month:
-                days_elapsed = today.day
-            else:
-                # For historical partial months, estimate based on report date
-                days_elapsed = report_date.day
-            
-            # Calculate days in month
-            if report_date.month == 12:
-                days_in_month = 31
-            else:
-                next_month = date(report_date.year, report_date.month + 1, 1)
-                days_in_month = (next_month - timedelta(days=1)).day
-            
-            if days_elapsed == 0:
-                return None
-            
-            # Project to full month (simple linear projection)
-            normalized = (value / days_elapsed) * days_in_month
-            return float(normalized)
-            
-        except (ValueError, TypeError):
+        span = _partial_month_span(report_date_str, date.today())
+        if span is None:
             return None
+        
+        days_elapsed, days_in_month = span
+        
+        # Project to full month (simple linear projection)
+        normalized = (value / days_elapsed) * days_in_month
+        return float(normalized)
     
     @staticmethod
     def calculate_monthly_changes(
@@ -255,45 +287,54 @@ class TrendAnalyzer:
         if not isinstance(historical_data, list) or len(historical_data) < 2:
             return []
         
+        # Read each month's raw values once; every month after the first is
+        # compared as "current" and then reused as the next "previous"
+        raw_values = [
+            (
+                safe_float(safe_get(month, "cash_received"), 0.0),
+                safe_float(safe_get(month, "cash_spent"), 0.0),
+            )
+            if isinstance(month, dict) else None
+            for month in historical_data
+        ]
+        
+        # Partial-month checks are relative to today; read it once per call
+        today = date.today()
+        
         changes = []
         for i in range(1, len(historical_data)):
-            current = safe_list_get(historical_data, i, {})
-            previous = safe_list_get(historical_data, i - 1, {})
+            current_values = raw_values[i]
+            previous_values = raw_values[i - 1]
             
-            if not isinstance(current, dict) or not isinstance(previous, dict):
+            if current_values is None or previous_values is None:
                 continue
             
-            current_date = safe_get(current, "report_date")
-            is_partial = TrendAnalyzer._is_partial_month(current_date)
+            # raw_values only has entries for dict months
+            current_date = historical_data[i].get("report_date")
+            is_partial = isinstance(current_date, str) and _is_partial_month_on(current_date, today)
             
-            current_received = safe_float(safe_get(current, "cash_received"), 0.0)
-            current_spent = safe_float(safe_get(current, "cash_spent"), 0.0)
-            previous_received = safe_float(safe_get(previous, "cash_received"), 0.0)
-            previous_spent = safe_float(safe_get(previous, "cash_spent"), 0.0)
+            current_received, current_spent = current_values
+            previous_received, previous_spent = previous_values
             
             # Normalize partial month values for fair comparison
             if is_partial:
-                normalized_received = TrendAnalyzer._normalize_for_partial_month(
-                    current_received, current_date
-                )
-                normalized_spent = TrendAnalyzer._normalize_for_partial_month(
-                    current_spent, current_date
-                )
-                
-                # Use normalized values if available, otherwise use raw (with warning)
-                if normalized_received is not None:
-                    current_received = normalized_received
-                if normalized_spent is not None:
-                    current_spent = normalized_spent
+                # One span serves both metrics (linear projection to full month)
+                span = _partial_month_span(current_date, today)
+                if span is not None:
+                    days_elapsed, days_in_month = span
+                    current_received = (current_received / days_elapsed) * days_in_month
+                    current_spent = (current_spent / days_elapsed) * days_in_month
                 
-                logger.debug(
-                    "Normalized partial month %s: received %.2f -> %.2f, spent %.2f -> %.2f",
-                    current_date,
-                    safe_float(safe_get(current, "cash_received"), 0.0),
-                    current_received,
-                    safe_float(safe_get(current, "cash_spent"), 0.0),
-                    current_spent
-                )
+                if logger.isEnabledFor(logging.DEBUG):
+                    raw_received, raw_spent = current_values
+                    logger.debug(
+                        "Normalized partial month %s: received %.2f -> %.2f, spent %.2f -> %.2f",
+                        current_date,
+                        raw_received,
+                        current_received,
+                        raw_spent,
+                        current_spent
+                    )
             
             cash_received_change = TrendAnalyzer.calculate_percentage_change(
                 current_received,
@@ -332,7 +373,7 @@ class TrendAnalyzer:
         Returns:
             Dictionary with all trend metrics
         """
-        all_data = executive_summary_history + [executive_summary_current]
+        all_data = [*executive_summary_history, executive_summary_current]
         
         expense_acceleration = TrendAnalyzer.calculate_expense_acceleration(all_data)
         revenue_volatility = TrendAnalyzer.calculate_revenue_volatility(all_data)
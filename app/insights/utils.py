@@ -17,10 +17,11 @@ def safe_get(data: Any, key: str, default: Any = None) -> Any:
     Returns:
         Value from dict, or default if missing/None
     """
-    if not isinstance(data, dict):
+    # Exact-type check first: plain dicts are the common case
+    if type(data) is not dict and not isinstance(data, dict):
         return default
     
-    value = data.get(key, default)
+    value = data.get(key)
     return default if value is None else value
 
 
@@ -76,6 +77,12 @@ def safe_float(value: Any, default: float = 0.0) -> float:
     Returns:
         Float value, or default
     """
+    # Fast paths for values that are already numeric (the common case)
+    value_type = type(value)
+    if value_type is float:
+        return value
+    if value_type is int:
+        return float(value)
     if value is None:
         return default
     
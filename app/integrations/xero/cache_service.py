@@ -3,13 +3,16 @@ Cache Service for Xero Data
 Manages caching of Executive Summary and financial data.
 """
 
+import calendar
 import logging
 from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
+from functools import lru_cache
 from typing import Any, Optional
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, Date, any_, bindparam, delete, func, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
@@ -28,6 +31,81 @@ LAST_MONTH_TTL_HOURS = 24    # Re-fetch last month every 24 hours
 # Historical months: expires_at = None (never expires)
 
 
+@lru_cache(maxsize=256)
+def _month_end_date(year: int, month: int) -> date:
+    """Get the last day of a given month (pure, so memoized)."""
+    return date(year, month, calendar.monthrange(year, month)[1])
+
+
+@lru_cache(maxsize=64)
+def _historical_month_ends(today: date, months: int) -> tuple[date, ...]:
+    """
+    Get month-end dates for the complete months before today's month.
+    
+    Cached on (today, months), so results roll over at midnight.
+    """
+    # Zero-based month index; floor division/modulo handle year wraparound
+    base = today.month - 1
+    return tuple(
+        _month_end_date(today.year + (base - i) // 12, (base - i) % 12 + 1)
+        for i in range(1, months + 1)
+    )
+
+
+@lru_cache(maxsize=128)
+def _month_ends_in_range(start_date: date, end_date: date) -> tuple[date, ...]:
+    """Get all month-end dates within a date range (inclusive, memoized)."""
+    # Months as year * 12 + zero-based month; start's own month-end is
+    # always >= start_date, so the range begins at start's month
+    first = start_date.year * 12 + start_date.month - 1
+    last = end_date.year * 12 + end_date.month - 1
+    
+    # end_date's own month only counts if end_date is its month-end
+    if end_date < _month_end_date(end_date.year, end_date.month):
+        last -= 1
+    
+    return tuple(
+        _month_end_date(index // 12, index % 12 + 1)
+        for index in range(first, last + 1)
+    )
+
+
+def _any_report_date(report_dates: list[date]) -> ColumnElement[Any]:
+    """
+    Build "= ANY(:report_dates)" for a list of dates.
+    
+    A single array parameter keeps one statement shape whatever the list
+    length, unlike IN, so cached statements and plans are reused.
+    """
+    return any_(bindparam("report_dates", value=list(report_dates), type_=ARRAY(Date)))
+
+
+# Columns refreshed when a cached Executive Summary month is saved again
+_EXEC_SUMMARY_UPSERT_FIELDS = (
+    "cash_position",
+    "cash_spent",
+    "cash_received",
+    "operating_expenses",
+    "raw_data",
+    "fetched_at",
+)
+
+
+def _to_decimal(value: Any) -> Optional[Decimal]:
+    """
+    Convert a numeric value to Decimal for Numeric columns.
+    
+    Decimals pass through and ints convert exactly; anything else goes
+    through str() so floats keep their shortest round-trip repr.
+    """
+    if value is None:
+        return None
+    value_type = type(value)
+    if value_type is Decimal:
+        return value
+    if value_type is int:
+        return Decimal(value)
+    return Decimal(str(value))
 
 
 class CacheService:
@@ -37,42 +115,30 @@ class CacheService:
     Handles:
     - Executive Summary (current month with TTL, historical months forever)
     - Receivables, Payables, P&L (with TTL)
+    
+    Reads run on every dashboard load with fixed statement shapes, so they
+    rely on the engine's query and prepared statement caches
+    (see app.database.connection).
     """
     
     def __init__(self, db: AsyncSession):
         self.db = db
         self.cache_ttl_minutes = settings.cache_ttl_minutes
+        self._ttl = timedelta(minutes=self.cache_ttl_minutes)
     
-    def _calculate_expires_at(self) -> datetime:
-        """Calculate expiration time based on TTL."""
-        return datetime.now(timezone.utc) + timedelta(minutes=self.cache_ttl_minutes)
+    def _calculate_expires_at(self, now: Optional[datetime] = None) -> datetime:
+        """Calculate expiration time based on TTL, from now unless given."""
+        return (now or datetime.now(timezone.utc)) + self._ttl
     
     def _get_month_end_date(self, year: int, month: int) -> date:
         """Get the last day of a given month."""
-        if month == 12:
-            return date(year, 12, 31)
-        else:
-            next_month = date(year, month + 1, 1)
-            return next_month - timedelta(days=1)
+        return _month_end_date(year, month)
     
     def _calculate_historical_month_ends(self, months: int) -> list[date]:
         """Calculate month-end dates for historical months."""
         today = datetime.now(timezone.utc).date()
-        current_month_start = today.replace(day=1)
-        
-        month_ends = []
-        for i in range(1, months + 1):
-            target_year = current_month_start.year
-            target_month = current_month_start.month - i
-            
-            while target_month <= 0:
-                target_month += 12
-                target_year -= 1
-            
-            month_end = self._get_month_end_date(target_year, target_month)
-            month_ends.append(month_end)
-        
-        return month_ends
+        # Copy so callers can't mutate the cached result
+        return list(_historical_month_ends(today, months))
     
     def calculate_month_ends_in_range(self, start_date: date, end_date: date) -> list[date]:
         """
@@ -90,36 +156,8 @@ class CacheService:
             end_date = 2026-01-06
             Returns: [2025-07-31, 2025-08-31, 2025-09-30, 2025-10-31, 2025-11-30, 2025-12-31]
         """
-        month_ends = []
-        
-        # Start from first month-end after or equal to start_date
-        current = start_date.replace(day=1)
-        if current.month == 12:
-            current = date(current.year + 1, 1, 1)
-        else:
-            current = date(current.year, current.month + 1, 1)
-        current = current - timedelta(days=1)  # Last day of start_date's month
-        
-        # If start_date is after month-end, move to next month
-        if start_date > current:
-            if current.month == 12:
-                current = date(current.year + 1, 1, 31)
-            else:
-                next_month = date(current.year, current.month + 1, 1)
-                current = next_month - timedelta(days=1)
-        
-        # Collect all month-ends up to end_date's month
-        while current <= end_date:
-            month_ends.append(current)
-            
-            # Move to next month-end
-            if current.month == 12:
-                current = date(current.year + 1, 1, 31)
-            else:
-                next_month = date(current.year, current.month + 1, 1)
-                current = next_month - timedelta(days=1)
-        
-        return month_ends
+        # Copy so callers can't mutate the cached result
+        return list(_month_ends_in_range(start_date, end_date))
     
     async def get_cached_executive_summary(
         self,
@@ -149,16 +187,15 @@ class CacheService:
         historical_dates = self._calculate_historical_month_ends(months)
         
         stmt = (
-            select(ExecutiveSummaryCache)
+            select(*ExecutiveSummaryCache.dict_columns())
             .where(ExecutiveSummaryCache.organization_id == organization_id)
-            .where(ExecutiveSummaryCache.report_date.in_(historical_dates))
+            .where(ExecutiveSummaryCache.report_date == _any_report_date(historical_dates))
         )
         result = await self.db.execute(stmt)
-        cached_historical = result.scalars().all()
         
         # Build map: report_date -> cached_data
         historical_map = {
-            item.report_date: item.to_dict() for item in cached_historical
+            row.report_date: ExecutiveSummaryCache.row_to_dict(row) for row in result
         }
         
         # Determine missing dates
@@ -185,15 +222,14 @@ class CacheService:
             return {}
         
         stmt = (
-            select(ExecutiveSummaryCache)
+            select(*ExecutiveSummaryCache.dict_columns())
             .where(ExecutiveSummaryCache.organization_id == organization_id)
-            .where(ExecutiveSummaryCache.report_date.in_(month_end_dates))
+            .where(ExecutiveSummaryCache.report_date == _any_report_date(month_end_dates))
         )
         result = await self.db.execute(stmt)
-        cached_historical = result.scalars().all()
         
         return {
-            item.report_date: item.to_dict() for item in cached_historical
+            row.report_date: ExecutiveSummaryCache.row_to_dict(row) for row in result
         }
     
     async def get_cached_financial_data(
@@ -270,34 +306,31 @@ class CacheService:
             profit_loss_data: P&L report data to cache
         """
         now = datetime.now(timezone.utc)
-        expires_at = self._calculate_expires_at()
-        
-        # Check if exact range already exists
-        stmt = (
-            select(ProfitLossCache)
-            .where(ProfitLossCache.organization_id == organization_id)
-            .where(ProfitLossCache.start_date == start_date)
-            .where(ProfitLossCache.end_date == end_date)
+        expires_at = self._calculate_expires_at(now)
+        
+        # Insert or refresh the exact range in one statement
+        insert_stmt = pg_insert(ProfitLossCache).values(
+            organization_id=organization_id,
+            start_date=start_date,
+            end_date=end_date,
+            profit_loss_data=profit_loss_data,
+            fetched_at=now,
+            expires_at=expires_at,
         )
-        result = await self.db.execute(stmt)
-        existing = result.scalar_one_or_none()
-        
-        if existing:
-            # Update existing
-            existing.profit_loss_data = profit_loss_data
-            existing.fetched_at = now
-            existing.expires_at = expires_at
-        else:
-            # Create new
-            new_cache = ProfitLossCache(
-                organization_id=organization_id,
-                start_date=start_date,
-                end_date=end_date,
-                profit_loss_data=profit_loss_data,
-                fetched_at=now,
-                expires_at=expires_at,
-            )
-            self.db.add(new_cache)
+        upsert_stmt = insert_stmt.on_conflict_do_update(
+            index_elements=[
+                ProfitLossCache.organization_id,
+                ProfitLossCache.start_date,
+                ProfitLossCache.end_date,
+            ],
+            set_={
+                "profit_loss_data": insert_stmt.excluded.profit_loss_data,
+                "fetched_at": insert_stmt.excluded.fetched_at,
+                "expires_at": insert_stmt.excluded.expires_at,
+                "updated_at": func.now(),
+            },
+        )
+        await self.db.execute(upsert_stmt)
         
         await self.db.commit()
         logger.info(
@@ -322,53 +355,57 @@ class CacheService:
             historical: List of historical month data
         """
         now = datetime.now(timezone.utc)
-        expires_at = self._calculate_expires_at()
+        expires_at = self._calculate_expires_at(now)
         
         # 1. Save current month to FinancialCache
-        financial_cache = await self._get_or_create_financial_cache(organization_id)
-        financial_cache.executive_summary_current = current
-        financial_cache.executive_summary_current_fetched_at = now
-        financial_cache.executive_summary_current_expires_at = expires_at
+        await self._upsert_financial_cache(
+            organization_id,
+            executive_summary_current=current,
+            executive_summary_current_fetched_at=now,
+            executive_summary_current_expires_at=expires_at,
+        )
         
         # 2. Save historical months to ExecutiveSummaryCache
+        # Keyed by date: a statement may not upsert the same row twice
+        months_by_date: dict[date, dict[str, Any]] = {}
         for month_data in historical:
             report_date_str = month_data.get("report_date")
             if not report_date_str:
                 logger.warning("Missing report_date in historical data, skipping")
                 continue
             
-            report_date = date.fromisoformat(report_date_str)
-            
-            # Check if already exists
-            stmt = (
-                select(ExecutiveSummaryCache)
-                .where(ExecutiveSummaryCache.organization_id == organization_id)
-                .where(ExecutiveSummaryCache.report_date == report_date)
+            months_by_date[date.fromisoformat(report_date_str)] = month_data
+        
+        # Insert or refresh all months in one statement
+        if months_by_date:
+            rows = [
+                {
+                    "organization_id": organization_id,
+                    "report_date": report_date,
+                    "cash_position": _to_decimal(month_data["cash_position"]),
+                    "cash_spent": _to_decimal(month_data["cash_spent"]),
+                    "cash_received": _to_decimal(month_data["cash_received"]),
+                    "operating_expenses": _to_decimal(month_data["operating_expenses"]),
+                    "raw_data": month_data.get("raw_data"),
+                    "fetched_at": now,
+                }
+                for report_date, month_data in months_by_date.items()
+            ]
+            insert_stmt = pg_insert(ExecutiveSummaryCache).values(rows)
+            upsert_stmt = insert_stmt.on_conflict_do_update(
+                index_elements=[
+                    ExecutiveSummaryCache.organization_id,
+                    ExecutiveSummaryCache.report_date,
+                ],
+                set_={
+                    **{
+                        field: insert_stmt.excluded[field]
+                        for field in _EXEC_SUMMARY_UPSERT_FIELDS
+                    },
+                    "updated_at": func.now(),
+                },
             )
-            result = await self.db.execute(stmt)
-            existing = result.scalar_one_or_none()
-            
-            if existing:
-                # Update existing
-                existing.cash_position = Decimal(str(month_data["cash_position"]))
-                existing.cash_spent = Decimal(str(month_data["cash_spent"]))
-                existing.cash_received = Decimal(str(month_data["cash_received"]))
-                existing.operating_expenses = Decimal(str(month_data["operating_expenses"]))
-                existing.raw_data = month_data.get("raw_data")
-                existing.fetched_at = now
-            else:
-                # Create new
-                new_cache = ExecutiveSummaryCache(
-                    organization_id=organization_id,
-                    report_date=report_date,
-                    cash_position=Decimal(str(month_data["cash_position"])),
-                    cash_spent=Decimal(str(month_data["cash_spent"])),
-                    cash_received=Decimal(str(month_data["cash_received"])),
-                    operating_expenses=Decimal(str(month_data["operating_expenses"])),
-                    raw_data=month_data.get("raw_data"),
-                    fetched_at=now,
-                )
-                self.db.add(new_cache)
+            await self.db.execute(upsert_stmt)
         
         await self.db.commit()
         logger.info(
@@ -392,13 +429,15 @@ class CacheService:
             payables: Payables data
         """
         now = datetime.now(timezone.utc)
-        expires_at = self._calculate_expires_at()
+        expires_at = self._calculate_expires_at(now)
         
-        financial_cache = await self._get_or_create_financial_cache(organization_id)
-        financial_cache.invoices_receivable = receivables
-        financial_cache.invoices_payable = payables
-        financial_cache.fetched_at = now
-        financial_cache.expires_at = expires_at
+        await self._upsert_financial_cache(
+            organization_id,
+            invoices_receivable=receivables,
+            invoices_payable=payables,
+            fetched_at=now,
+            expires_at=expires_at,
+        )
         
         await self.db.commit()
         logger.info("Saved financial data cache for org %s", organization_id)
@@ -412,30 +451,11 @@ class CacheService:
         Args:
             organization_id: Organization UUID
         """
-        # Delete FinancialCache
-        financial_cache = await self._get_financial_cache(organization_id)
-        if financial_cache:
-            await self.db.delete(financial_cache)
-        
-        # Delete all ExecutiveSummaryCache records
-        stmt = (
-            select(ExecutiveSummaryCache)
-            .where(ExecutiveSummaryCache.organization_id == organization_id)
-        )
-        result = await self.db.execute(stmt)
-        historical_cache = result.scalars().all()
-        for cache in historical_cache:
-            await self.db.delete(cache)
-        
-        # Delete all ProfitLossCache records
-        stmt = (
-            select(ProfitLossCache)
-            .where(ProfitLossCache.organization_id == organization_id)
-        )
-        result = await self.db.execute(stmt)
-        pnl_cache = result.scalars().all()
-        for cache in pnl_cache:
-            await self.db.delete(cache)
+        # One bulk DELETE per cache table
+        for model in (FinancialCache, ExecutiveSummaryCache, ProfitLossCache):
+            await self.db.execute(
+                delete(model).where(model.organization_id == organization_id)
+            )
         
         await self.db.commit()
         logger.info("Invalidated all cache for org %s", organization_id)
@@ -450,42 +470,62 @@ class CacheService:
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
     
-    async def _get_or_create_financial_cache(
-        self, organization_id: UUID
-    ) -> FinancialCache:
-        """Get or create FinancialCache for organization."""
-        cache = await self._get_financial_cache(organization_id)
-        if cache is None:
-            cache = FinancialCache(
-                organization_id=organization_id,
-                fetched_at=datetime.now(timezone.utc),
-                expires_at=self._calculate_expires_at(),
-            )
-            self.db.add(cache)
-        return cache
+    async def _upsert_financial_cache(
+        self, organization_id: UUID, **fields: Any
+    ) -> None:
+        """
+        Insert or update FinancialCache for organization in one statement.
+        
+        Only the given columns are written; on conflict, other columns keep
+        their current values.
+        
+        Args:
+            organization_id: Organization UUID
+            **fields: FinancialCache column values to write
+        """
+        insert_stmt = pg_insert(FinancialCache).values(
+            organization_id=organization_id, **fields
+        )
+        upsert_stmt = insert_stmt.on_conflict_do_update(
+            index_elements=[FinancialCache.organization_id],
+            set_={
+                **{field: insert_stmt.excluded[field] for field in fields},
+                "updated_at": func.now(),
+            },
+        )
+        await self.db.execute(upsert_stmt)
     
     # =====================================================
     # Monthly P&L Cache Methods
     # =====================================================
     
-    def _calculate_monthly_pnl_expires_at(self, year: int, month: int) -> Optional[datetime]:
+    def _calculate_monthly_pnl_expires_at(
+        self,
+        year: int,
+        month: int,
+        now: Optional[datetime] = None,
+        today: Optional[date] = None,
+    ) -> Optional[datetime]:
         """
         Calculate expiration time for monthly P&L cache.
         
         - Current month: 1 hour TTL
         - Last month: 24 hour TTL  
         - Historical months: Never expires (returns None)
+        
+        Callers saving several months pass now/today so the clock is read once.
         """
-        today = date.today()
+        if today is None:
+            today = date.today()
         
         # Current month
         if year == today.year and month == today.month:
-            return datetime.now(timezone.utc) + timedelta(hours=CURRENT_MONTH_TTL_HOURS)
+            return (now or datetime.now(timezone.utc)) + timedelta(hours=CURRENT_MONTH_TTL_HOURS)
         
         # Last month
         last_month = (today.replace(day=1) - timedelta(days=1))
         if year == last_month.year and month == last_month.month:
-            return datetime.now(timezone.utc) + timedelta(hours=LAST_MONTH_TTL_HOURS)
+            return (now or datetime.now(timezone.utc)) + timedelta(hours=LAST_MONTH_TTL_HOURS)
         
         # Historical months - never expire
         return None
@@ -560,6 +600,7 @@ class CacheService:
             account_map: AccountID → AccountInfo mapping for P&L extraction
         """
         now = datetime.now(timezone.utc)
+        today = date.today()
         saved_count = 0
         
         for month_entry in monthly_data:
@@ -574,7 +615,7 @@ class CacheService:
                 continue
             
             # Calculate TTL based on month
-            expires_at = self._calculate_monthly_pnl_expires_at(year, month)
+            expires_at = self._calculate_monthly_pnl_expires_at(year, month, now, today)
             
             # Extract P&L totals so cache has usable values
             revenue = None
@@ -610,10 +651,10 @@ class CacheService:
             if existing:
                 # Update existing
                 existing.raw_data = pnl_data
-                existing.revenue = Decimal(str(revenue)) if revenue is not None else None
-                existing.cost_of_sales = Decimal(str(cost_of_sales)) if cost_of_sales is not None else None
-                existing.expenses = Decimal(str(expenses)) if expenses is not None else None
-                existing.net_profit = Decimal(str(net_profit)) if net_profit is not None else None
+                existing.revenue = _to_decimal(revenue)
+                existing.cost_of_sales = _to_decimal(cost_of_sales)
+                existing.expenses = _to_decimal(expenses)
+                existing.net_profit = _to_decimal(net_profit)
                 existing.fetched_at = now
                 existing.expires_at = expires_at
             else:
@@ -623,10 +664,10 @@ class CacheService:
                     month_key=month_key,
                     year=year,
                     month=month,
-                    revenue=Decimal(str(revenue)) if revenue is not None else None,
-                    cost_of_sales=Decimal(str(cost_of_sales)) if cost_of_sales is not None else None,
-                    expenses=Decimal(str(expenses)) if expenses is not None else None,
-                    net_profit=Decimal(str(net_profit)) if net_profit is not None else None,
+                    revenue=_to_decimal(revenue),
+                    cost_of_sales=_to_decimal(cost_of_sales),
+                    expenses=_to_decimal(expenses),
+                    net_profit=_to_decimal(net_profit),
                     raw_data=pnl_data,
                     fetched_at=now,
                     expires_at=expires_at,
@@ -60,6 +60,7 @@ class CalculatedMetrics(Base, UUIDMixin, TimestampMixin):
             calculated_at: When metrics were calculated
             data_period_start: Start of data period used
             data_period_end: End of data period used
+            last_inputs_hash: Hash of inputs behind the last AI generation
         
         organization: Related organization
         created_at: Timestamp of creation
@@ -200,6 +201,12 @@ class CalculatedMetrics(Base, UUIDMixin, TimestampMixin):
         comment="Full JSON payload of Business Health Score (0-100)",
     )
     
+    last_inputs_hash: Mapped[Optional[str]] = mapped_column(
+        String(64),
+        nullable=True,
+        comment="SHA-256 of the inputs behind the last complete AI generation",
+    )
+    
     # Relationships
     organization: Mapped["Organization"] = relationship(
         "Organization",
@@ -124,14 +124,34 @@ class ExecutiveSummaryCache(Base, UUIDMixin, TimestampMixin):
             f")>"
         )
     
-    def to_dict(self) -> dict[str, Any]:
-        """Convert to dictionary format matching XeroDataFetcher output."""
+    @classmethod
+    def dict_columns(cls) -> tuple[Any, ...]:
+        """Columns read by row_to_dict(), for selects that skip ORM instances."""
+        return (
+            cls.report_date,
+            cls.cash_position,
+            cls.cash_spent,
+            cls.cash_received,
+            cls.operating_expenses,
+            cls.raw_data,
+        )
+    
+    @staticmethod
+    def row_to_dict(row: Any) -> dict[str, Any]:
+        """
+        Convert an instance, or a row selected with dict_columns(), to
+        dictionary format matching XeroDataFetcher output.
+        """
         return {
-            "cash_position": float(self.cash_position),
-            "cash_spent": float(self.cash_spent),
-            "cash_received": float(self.cash_received),
-            "operating_expenses": float(self.operating_expenses),
-            "report_date": self.report_date.isoformat(),
-            "raw_data": self.raw_data,
+            "cash_position": float(row.cash_position),
+            "cash_spent": float(row.cash_spent),
+            "cash_received": float(row.cash_received),
+            "operating_expenses": float(row.operating_expenses),
+            "report_date": row.report_date.isoformat(),
+            "raw_data": row.raw_data,
         }
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary format matching XeroDataFetcher output."""
+        return self.row_to_dict(self)
 
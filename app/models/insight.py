@@ -7,7 +7,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import String, Text, ForeignKey, DateTime, Boolean, Index, JSON
+from sqlalchemy import String, Text, ForeignKey, DateTime, Boolean, Index, JSON, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -201,7 +201,7 @@ class Insight(Base, UUIDMixin, TimestampMixin):
         Index("ix_insights_generated_at", "generated_at"),
         Index("ix_insights_acknowledged", "is_acknowledged"),
         Index("ix_insights_marked_done", "is_marked_done"),
-        Index("ix_insights_org_insight_id", "organization_id", "insight_id"),
+        UniqueConstraint("organization_id", "insight_id", name="uq_insights_org_insight_id"),
     )
     
     def __repr__(self) -> str: